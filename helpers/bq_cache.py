@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Local cache for BigQuery OKR snapshots.
+Query results are stored as parquet files keyed by the latest scrape timestamp
+(or a table's last-modified time), so repeated runs against the same data skip
+the download.
+"""
+
+import hashlib
+from pathlib import Path
+
+import pandas as pd
+
+CACHE_DIR = Path.home() / ".cache" / "okrs"
+
+
+def get_latest_snapshot_id(client, dataset):
+    """
+    Get the created_at value of the most recent scrape.
+
+    Args:
+        client: BigQuery client
+        dataset (str): Dataset holding okrs_latest_view
+
+    Returns:
+        str: Latest created_at (YYYYMMDDHHMM), or None if the view is empty
+    """
+    query = f'SELECT MAX(created_at) AS created_at FROM `{dataset}.okrs_latest_view`'
+    for row in client.query_and_wait(query):
+        return row['created_at']
+    return None
+
+
+def get_table_snapshot_id(client, table_id):
+    """
+    Get a cache key for a native table from its last-modified time.
+    Only reads table metadata, so no query job is run. External tables are
+    not cached: their modified time doesn't change when the files behind them do.
+
+    Args:
+        client: BigQuery client
+        table_id (str): Table as "dataset.table" or "project.dataset.table"
+
+    Returns:
+        str: Table name plus modification timestamp, or None if the table is
+        external or its modification time is unknown
+    """
+    table = client.get_table(table_id)
+    if table.table_type == 'EXTERNAL' or table.modified is None:
+        return None
+    return f"{table.table_id}-{int(table.modified.timestamp())}"
+
+
+def cached_query_to_dataframe(client, query, snapshot_id, bqstorage_client=None):
+    """
+    Run a query and return it as a DataFrame, reusing a local parquet copy
+    when the same query was already downloaded for this snapshot.
+
+    Args:
+        client: BigQuery client
+        query (str): SQL to run
+        snapshot_id (str): Latest created_at or table snapshot id; None disables the cache
+        bqstorage_client: Optional BigQuery Storage read client
+
+    Returns:
+        pd.DataFrame: Query results
+    """
+    if snapshot_id is None:
+        return client.query_and_wait(query).to_dataframe(bqstorage_client=bqstorage_client)
+
+    query_hash = hashlib.sha1(query.encode('utf-8')).hexdigest()[:12]
+    cache_file = CACHE_DIR / f"{snapshot_id}_{query_hash}.parquet"
+
+    if cache_file.exists():
+        print(f"💾 Using cached snapshot: {cache_file}")
+        return pd.read_parquet(cache_file)
+
+    df = client.query_and_wait(query).to_dataframe(bqstorage_client=bqstorage_client)
+
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # Write then rename so an interrupted run never leaves a truncated cache file
+        tmp_file = cache_file.with_suffix('.tmp')
+        df.to_parquet(tmp_file, compression='zstd')
+        tmp_file.replace(cache_file)
+    except (OSError, ImportError) as e:
+        print(f"⚠️ Could not write snapshot cache: {e}")
+
+    return df
@@ -5,6 +5,7 @@ Loads configuration from config.env file.
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
 
 
@@ -36,7 +37,23 @@ def load_config():
             "config.env file not found. Please copy config.env.example to config.env and configure it."
         )
     
-    # Load environment variables from config.env
+    # Parsed once per file version; callers get their own copy to modify
+    return dict(parse_config_file(config_file, config_file.stat().st_mtime_ns))
+
+
+@lru_cache(maxsize=4)
+def parse_config_file(config_file, modified_time_ns):
+    """
+    Parse a config.env file into a dictionary.
+    Cached by path and modification time, so the file is only re-read when it changes.
+    
+    Args:
+        config_file (Path): Path to config.env
+        modified_time_ns (int): File modification time, part of the cache key
+        
+    Returns:
+        dict: Configuration dictionary with all environment variables
+    """
     config = {}
     with open(config_file, 'r') as f:
         for line in f:
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+OKR sanity-check definitions shared by the CSV-based tools.
+Required fields, the missing-field check and the lookup of the latest processed CSV.
+"""
+
+import fnmatch
+import importlib.util
+import io
+import os
+
+import numpy as np
+
+# google-cloud-storage is only imported when downloading
+try:
+    CLOUD_STORAGE_AVAILABLE = importlib.util.find_spec('google.cloud.storage') is not None
+except ModuleNotFoundError:
+    CLOUD_STORAGE_AVAILABLE = False
+
+LATEST_CSV_PATTERN = "scraped/export-*_processed*.csv"
+
+# Values treated as "not set" once stripped and lowercased
+NULL_TOKENS = frozenset(['', 'null', 'nan', 'none', 'na'])
+
+# Required OKR fields as (CSV column, reported field name), in report order
+SANITY_FIELDS = [
+    ('Target Date', 'Target Date'),
+    ('Teams', 'Teams'),
+    ('Parent Goal', 'Parent Goal'),
+    ('Owner', 'Owner'),
+    ('Progress Type', 'Progress Type (Metric)'),
+    ('Lineage', 'Lineage'),
+]
+
+
+def find_missing_fields(okrs_df):
+    """
+    Vectorized sanity check for a whole DataFrame of OKRs.
+    Returns a boolean matrix (one row per OKR, one column per SANITY_FIELDS entry)
+    that is True where the field is missing.
+    """
+    masks = []
+    for column, _ in SANITY_FIELDS:
+        if column not in okrs_df.columns:
+            masks.append(np.ones(len(okrs_df), dtype=bool))
+            continue
+
+        # 'NONE' progress type is covered by the lowercased 'none' token
+        values = okrs_df[column].astype('string').str.strip().str.lower()
+        masks.append((values.isna() | values.isin(NULL_TOKENS)).to_numpy(dtype=bool))
+
+    return np.column_stack(masks)
+
+
+def find_latest_csv():
+    """Find the most recent processed CSV file"""
+    scraped_dir, name_pattern = os.path.split(LATEST_CSV_PATTERN)
+
+    # Single directory scan, keeping the most recently modified match
+    latest_file, latest_mtime = None, None
+    try:
+        with os.scandir(scraped_dir) as entries:
+            for entry in entries:
+                if fnmatch.fnmatch(entry.name, name_pattern) and entry.is_file():
+                    mtime = entry.stat().st_mtime
+                    if latest_mtime is None or mtime > latest_mtime:
+                        latest_file, latest_mtime = entry.path, mtime
+    except FileNotFoundError:
+        pass
+
+    if latest_file is None:
+        raise FileNotFoundError(f"No CSV files found matching pattern: {LATEST_CSV_PATTERN}")
+    return latest_file
+
+
+def download_latest_from_cloud():
+    """Download the latest OKRs CSV file from Cloud Storage, returning (buffer, blob name)"""
+    if not CLOUD_STORAGE_AVAILABLE:
+        raise ImportError("google-cloud-storage not available. Install with: pip install google-cloud-storage")
+    from google.cloud import storage
+
+    # Get bucket name - either from env var or compose from project ID
+    bucket_name = os.getenv('GCS_BUCKET_NAME')
+    if not bucket_name:
+        project_id = os.getenv('GOOGLE_CLOUD_PROJECT')
+        if not project_id:
+            # Try to get from gcloud config
+            try:
+                import subprocess
+                result = subprocess.run(['gcloud', 'config', 'get-value', 'project'],
+                                      capture_output=True, text=True, check=True)
+                project_id = result.stdout.strip()
+            except (subprocess.CalledProcessError, FileNotFoundError):
+                raise ValueError("Cannot determine project ID. Set GOOGLE_CLOUD_PROJECT or GCS_BUCKET_NAME environment variable")
+
+        bucket_name = f"{project_id}-okrs-data"
+
+    print(f"☁️ Connecting to Cloud Storage bucket: {bucket_name}")
+
+    try:
+        client = storage.Client()
+        bucket = client.bucket(bucket_name)
+
+        # List only processed CSV files, filtered server-side, and only fetch the
+        # metadata we use so each listing page stays small
+        csv_blobs = bucket.list_blobs(
+            prefix="okrs/export-",
+            match_glob="okrs/export-*_processed.csv",
+            fields="items(name,timeCreated),nextPageToken",
+        )
+
+        # Names embed the export timestamp (export-YYYYMMDD_HHMMSS_processed.csv),
+        # so the lexicographically greatest name is the most recent
+        latest_blob = max(csv_blobs, key=lambda b: b.name, default=None)
+
+        if latest_blob is None:
+            raise FileNotFoundError("No processed CSV files found in Cloud Storage bucket")
+
+        print(f"📁 Latest file found: {latest_blob.name}")
+        print(f"📅 Created: {latest_blob.time_created}")
+
+        # Download into memory; pd.read_csv reads the buffer directly
+        csv_buffer = io.BytesIO(latest_blob.download_as_bytes())
+
+        print(f"⬇️ Downloaded {csv_buffer.getbuffer().nbytes} bytes")
+        return csv_buffer, latest_blob.name
+
+    except Exception as e:
+        raise Exception(f"Error downloading from Cloud Storage: {e}")
@@ -33,7 +33,10 @@ SELECT
   COUNT(*) as total_okrs,
   SUM(CASE WHEN missing_count = 0 THEN 1 ELSE 0 END) as healthy_okrs,
   SUM(CASE WHEN missing_count > 0 THEN 1 ELSE 0 END) as malformed_okrs,
-  ROUND(SUM(CASE WHEN missing_count = 0 THEN 1 ELSE 0 END) * 100.0 / COUNT(*), 1) as health_percentage
+  ROUND(SUM(CASE WHEN missing_count = 0 THEN 1 ELSE 0 END) * 100.0 / COUNT(*), 1) as health_percentage,
+  -- Team members without OKRs (lets the summary skip query 6 when this is 0)
+  (SELECT COUNT(DISTINCT LOWER(TRIM(name))) FROM `{project_id}.okrs_dataset.teams`)
+    - COUNT(DISTINCT LOWER(TRIM(owner))) as people_without_okrs
 FROM enhanced_health_check;
 
 -- 2. OKRs HEALTH BY TEAM
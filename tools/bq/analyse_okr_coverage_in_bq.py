@@ -10,14 +10,18 @@ Dependencies are managed in pyproject.toml. Install with: uv sync
 import sys
 import os
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 # Add helpers directory to path for config loader (go up 3 levels: bq -> tools -> project root -> helpers)
 helpers_dir = Path(__file__).parent.parent.parent / "helpers"
 sys.path.insert(0, str(helpers_dir))
 
+from bq_cache import cached_query_to_dataframe, get_latest_snapshot_id, get_table_snapshot_id
 from config_loader import get_bigquery_config, get_cre_teams, get_us_people
+import numpy as np
 import pandas as pd
 from google.cloud import bigquery
+from google.cloud import bigquery_storage
 from typing import Dict, List, Set
 from difflib import SequenceMatcher
 
@@ -30,6 +34,14 @@ CRE_TEAMS = get_cre_teams()
 # US-based people to exclude from EMEA analysis - from configuration
 US_PEOPLE = get_us_people()
 
+# Columns read from okrs_latest_view, mapped to the CSV-style names used below
+OKR_COLUMNS = {
+    'goal_key': 'Goal Key',
+    'goal_name': 'Name',
+    'owner': 'Owner',
+    'parent_goal': 'Parent Goal',
+}
+
 # Corporate objectives as transcribed from the slides
 CORPORATE_OBJECTIVES_TRANSCRIBED = {
     "Enterprise-grade": {
@@ -63,21 +75,33 @@ CORPORATE_OBJECTIVES_TRANSCRIBED = {
     }
 }
 
-def get_all_goals_hierarchy(client):
+# Key terms searched in goal names for each corporate objective
+CORPORATE_SEARCH_TERMS = {
+    "Enterprise-grade": ["enterprise", "compass", "dci"],
+    "Integration, Innovation, and Efficiency": ["integration", "seamless", "product", "human", "dci platform"],
+    "Exit/IPO Ready": ["productivity", "improve", "20%", "efficiency"],
+}
+
+def get_all_goals_hierarchy(client, bqstorage_client=None):
     """Get all goal hierarchy from BigQuery external table views"""
     # Use latest view instead of raw table - automatically gets most recent data
-    okrs_query = f'SELECT * FROM `{config["dataset"]}.okrs_latest_view`'
-    okrs_df = client.query(okrs_query).to_dataframe()
+    okrs_query = f'SELECT {", ".join(OKR_COLUMNS)} FROM `{config["dataset"]}.okrs_latest_view`'
+    # Reuse the local copy when the latest scrape has already been downloaded
+    snapshot_id = get_latest_snapshot_id(client, config["dataset"])
+    okrs_df = cached_query_to_dataframe(client, okrs_query, snapshot_id, bqstorage_client)
+    okrs_df = okrs_df.rename(columns=OKR_COLUMNS)
     return okrs_df
 
-def get_cre_members(client):
+def get_cre_members(client, bqstorage_client=None):
     """Get CRE team members"""
     teams_query = f'''
     SELECT team, name AS person 
     FROM `{config["dataset"]}.{config["teams_table"]}`
     WHERE team IN ({",".join([f"'{team}'" for team in CRE_TEAMS])})
     '''
-    teams_df = client.query(teams_query).to_dataframe()
+    # The teams table rarely changes, so reuse the local copy until it is modified
+    snapshot_id = get_table_snapshot_id(client, f'{config["dataset"]}.{config["teams_table"]}')
+    teams_df = cached_query_to_dataframe(client, teams_query, snapshot_id, bqstorage_client)
     return set(teams_df['person'].str.strip())
 
 def similarity(a, b):
@@ -91,6 +115,7 @@ def find_matching_corporate_goals(okrs_df):
     
     # Get all unique goals (no duplicates)
     all_goals = okrs_df['Name'].dropna().unique()
+    goal_strs = [str(goal).lower() for goal in all_goals]
     
     matches = {}
     
@@ -102,19 +127,17 @@ def find_matching_corporate_goals(okrs_df):
         best_matches = []
         
         # Key terms to search for
-        search_terms = []
-        if "enterprise" in corp_name.lower():
-            search_terms = ["enterprise", "compass", "dci"]
-        elif "integration" in corp_name.lower():
-            search_terms = ["integration", "seamless", "product", "human", "dci platform"]
-        elif "exit" in corp_name.lower() or "ipo" in corp_name.lower():
-            search_terms = ["productivity", "improve", "20%", "efficiency"]
-        
-        for goal in all_goals:
-            goal_str = str(goal).lower()
-            
+        search_terms = CORPORATE_SEARCH_TERMS.get(corp_name, [])
+        
+        for goal, goal_str in zip(all_goals, goal_strs):
             # Calculate score based on key terms and similarity
             term_score = sum(1 for term in search_terms if term in goal_str)
+            
+            # Without a term hit the combined score is at most 0.3 * 1.0, which never
+            # clears the threshold, so skip the (expensive) similarity ratio
+            if term_score == 0:
+                continue
+            
             similarity_score = similarity(corp_data['description'], goal_str)
             
             combined_score = (term_score * 0.7) + (similarity_score * 0.3)
@@ -147,43 +170,36 @@ def analyze_goal_hierarchy_coverage(okrs_df, corporate_matches, cre_members):
     
     coverage_results = {}
     
-    # Build hierarchy map
-    goal_to_children = {}
-    goal_to_parent = {}
-    
-    for _, row in okrs_df.iterrows():
-        goal_id = row.get('Goal Key', '')
-        parent_id = row.get('Parent Goal', '')
-        
-        if goal_id:
-            goal_to_parent[goal_id] = parent_id
-            
-            if parent_id:
-                if parent_id not in goal_to_children:
-                    goal_to_children[parent_id] = []
-                goal_to_children[parent_id].append(goal_id)
+    # Build hierarchy as integer codes: one code per goal key and, per row,
+    # the code of its parent (-1 for no/unknown parent)
+    goal_keys = okrs_df['Goal Key'].where(okrs_df['Goal Key'] != '')
+    goal_codes, unique_goal_keys = goal_keys.factorize()
+    parent_codes = unique_goal_keys.get_indexer(okrs_df['Parent Goal'].where(okrs_df['Parent Goal'] != ''))
+    parent_codes[goal_codes < 0] = -1
 
     def get_all_descendant_goals(goal_name, okrs_df):
         """Get all descendant goals of a goal"""
         # Find Goal Key for this goal name
-        matching_rows = okrs_df[okrs_df['Name'] == goal_name]
-        if matching_rows.empty:
+        is_match = (okrs_df['Name'] == goal_name).to_numpy()
+        if not is_match.any():
             return set()
         
-        root_goal_ids = matching_rows['Goal Key'].tolist()
-        
-        all_descendants = set()
-        
-        def collect_descendants(goal_id):
-            all_descendants.add(goal_id)
-            children = goal_to_children.get(goal_id, [])
-            for child_id in children:
-                collect_descendants(child_id)
-        
-        for root_id in root_goal_ids:
-            collect_descendants(root_id)
-        
-        return all_descendants
+        root_goal_ids = set(okrs_df['Goal Key'][is_match])
+        # No non-empty Goal Key anywhere: there is no hierarchy to walk
+        if len(unique_goal_keys) == 0:
+            return root_goal_ids
+
+        # Expand one tree level per pass until no new goals are reached
+        in_hierarchy = np.zeros(len(unique_goal_keys), dtype=bool)
+        in_hierarchy[goal_codes[is_match & (goal_codes >= 0)]] = True
+        has_parent = parent_codes >= 0
+        while True:
+            reached = has_parent & in_hierarchy[parent_codes] & ~in_hierarchy[goal_codes]
+            if not reached.any():
+                break
+            in_hierarchy[goal_codes[reached]] = True
+        
+        return root_goal_ids | set(unique_goal_keys[in_hierarchy])
     
     # Analyze coverage for each corporate objective
     for corp_name, matches in corporate_matches.items():
@@ -236,7 +252,8 @@ def analyze_goal_hierarchy_coverage(okrs_df, corporate_matches, cre_members):
             'coverage_percentage': coverage_percentage,
             'total_okrs': total_okrs_in_hierarchy,
             'cre_okrs': cre_okrs_in_hierarchy,
-            'contributing_okrs': contributing_okrs
+            'contributing_okrs': contributing_okrs,
+            'descendant_ids': all_descendant_ids
         }
         
         print()
@@ -267,74 +284,42 @@ def analyze_unimpacted_goals(okrs_df, coverage_results, cre_members):
         
         main_goal = results['main_goal']
         
-        # Get all goals in this hierarchy
-        matching_rows = okrs_df[okrs_df['Name'] == main_goal]
-        if matching_rows.empty:
-            continue
-            
-        root_goal_ids = matching_rows['Goal Key'].tolist()
-        
-        # Build hierarchy map for traversal
-        goal_to_children = {}
-        for _, row in okrs_df.iterrows():
-            goal_id = row.get('Goal Key', '')
-            parent_id = row.get('Parent Goal', '')
-            
-            if parent_id:
-                if parent_id not in goal_to_children:
-                    goal_to_children[parent_id] = []
-                goal_to_children[parent_id].append(goal_id)
-        
-        def get_all_descendant_goals_with_details(root_ids):
-            """Get all descendant goals with their details"""
-            all_descendants = set()
-            
-            def collect_descendants(goal_id):
-                all_descendants.add(goal_id)
-                children = goal_to_children.get(goal_id, [])
-                for child_id in children:
-                    collect_descendants(child_id)
-            
-            for root_id in root_ids:
-                collect_descendants(root_id)
-            
-            return all_descendants
-        
-        all_descendant_ids = get_all_descendant_goals_with_details(root_goal_ids)
+        # Reuse the hierarchy already walked during the coverage step. That walk skips
+        # goals without a Goal Key, while this report has always pulled in every
+        # keyless goal (through the '' key) once one of them hangs off the hierarchy
+        all_descendant_ids = results['descendant_ids']
+        has_keyless_child = ((okrs_df['Goal Key'] == '') & okrs_df['Parent Goal'].isin(all_descendant_ids)).any()
+        if has_keyless_child:
+            all_descendant_ids = all_descendant_ids | {''}
         hierarchy_okrs = okrs_df[okrs_df['Goal Key'].isin(all_descendant_ids)]
         
         # Identify goals WITHOUT CRE team members but FROM EMEA region
         # We only care about EMEA goals that don't have CRE coverage
-        unimpacted_goals = []
-        emea_relevant_goals = []
-        
-        for _, goal in hierarchy_okrs.iterrows():
-            goal_owner = goal.get('Owner', '').strip()
-            
-            # Skip empty owners
-            if goal_owner == '':
-                continue
-                
-            # Only consider EMEA-relevant goals (those that CRE teams SHOULD potentially own)
-            # This excludes US-based people using configured list
-            emea_keywords = ['emea', 'europe', 'uk', 'germany', 'france', 'spain', 'italy', 'poland']
-            
-            is_us_person = any(us_name in goal_owner.lower() for us_name in US_PEOPLE)
-            
-            if is_us_person:
-                # Skip US-based people - not relevant for EMEA CRE analysis
-                continue
-                
-            emea_relevant_goals.append(goal)
-            
-            if goal_owner not in cre_members:
-                unimpacted_goals.append({
-                    'name': goal.get('Name', ''),
-                    'owner': goal_owner,
-                    'goal_key': goal.get('Goal Key', ''),
-                    'parent_goal': goal.get('Parent Goal', ''),
-                    'description': goal.get('Description', '')[:100] + '...' if goal.get('Description', '') else 'No description'
-                })
+        goal_owners = hierarchy_okrs['Owner'].fillna('').str.strip()
+        
+        # Only consider EMEA-relevant goals (those that CRE teams SHOULD potentially own).
+        # This excludes US-based people using configured list; the check only depends
+        # on the owner, so it runs once per distinct owner and is mapped onto the goals
+        owner_is_us = {owner: any(us_name in owner.lower() for us_name in US_PEOPLE)
+                       for owner in goal_owners.unique()}
+        is_emea_relevant = (goal_owners != '') & ~goal_owners.map(owner_is_us).astype(bool)
+        emea_relevant_goals = hierarchy_okrs[is_emea_relevant]
+        
+        is_unimpacted = is_emea_relevant & ~goal_owners.isin(cre_members)
+        unimpacted_okrs = hierarchy_okrs[is_unimpacted]
+        descriptions = unimpacted_okrs['Description'] if 'Description' in unimpacted_okrs else [''] * len(unimpacted_okrs)
+        unimpacted_goals = [
+            {
+                'name': name,
+                'owner': owner,
+                'goal_key': goal_key,
+                'parent_goal': parent_goal,
+                'description': description[:100] + '...' if description else 'No description'
+            }
+            for name, owner, goal_key, parent_goal, description in zip(
+                unimpacted_okrs['Name'], goal_owners[is_unimpacted], unimpacted_okrs['Goal Key'],
+                unimpacted_okrs['Parent Goal'], descriptions)
+        ]
         
         print(f"   📋 Main goal: {main_goal}")
         print(f"   📊 Total goals in hierarchy: {len(hierarchy_okrs)}")
@@ -480,10 +465,15 @@ def main():
     print("🔍 IMPROVED COVERAGE ANALYSIS (USING EXTERNAL TABLES)\n")
     
     client = bigquery.Client(project=config["project"]) if config["project"] else bigquery.Client()
-    
-    # Get data
-    okrs_df = get_all_goals_hierarchy(client)
-    cre_members = get_cre_members(client)
+    # One Storage API read client shared by every download (Arrow streams instead of REST pages)
+    bqstorage_client = bigquery_storage.BigQueryReadClient()
+    
+    # Get data (the two queries are independent, so run them side by side)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        okrs_future = executor.submit(get_all_goals_hierarchy, client, bqstorage_client)
+        cre_members_future = executor.submit(get_cre_members, client, bqstorage_client)
+        okrs_df = okrs_future.result()
+        cre_members = cre_members_future.result()
     
     print(f"📊 Data loaded:")
     print(f"   • Total goals: {len(okrs_df)}")
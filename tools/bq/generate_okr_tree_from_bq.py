@@ -9,14 +9,17 @@ Dependencies are managed in pyproject.toml. Install with: uv sync
 import sys
 import os
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 # Add helpers directory to path for config loader (go up 3 levels: bq -> tools -> project root -> helpers)
 helpers_dir = Path(__file__).parent.parent.parent / "helpers"
 sys.path.insert(0, str(helpers_dir))
 
+from bq_cache import cached_query_to_dataframe, get_latest_snapshot_id, get_table_snapshot_id
 from config_loader import get_bigquery_config, get_cre_teams
 import pandas as pd
 from google.cloud import bigquery
+from google.cloud import bigquery_storage
 from typing import Dict, List, Set
 
 # Load configuration
@@ -25,21 +28,34 @@ config = get_bigquery_config()
 # CRE Teams (Customer Reliability Engineers) - from configuration
 CRE_TEAMS = get_cre_teams()
 
-def get_cre_team_members(client):
+# Columns read from okrs_latest_view, mapped to the CSV-style names used below
+OKR_COLUMNS = {
+    'goal_key': 'Goal Key',
+    'goal_name': 'Name',
+    'owner': 'Owner',
+    'parent_goal': 'Parent Goal',
+}
+
+def get_cre_team_members(client, bqstorage_client=None):
     """Get all CRE team members"""
     teams_query = f'''
     SELECT team, name AS person 
     FROM `{config["dataset"]}.{config["teams_table"]}`
     WHERE team IN ({",".join([f"'{team}'" for team in CRE_TEAMS])})
     '''
-    teams_df = client.query(teams_query).to_dataframe()
+    # The teams table rarely changes, so reuse the local copy until it is modified
+    snapshot_id = get_table_snapshot_id(client, f'{config["dataset"]}.{config["teams_table"]}')
+    teams_df = cached_query_to_dataframe(client, teams_query, snapshot_id, bqstorage_client)
     return set(teams_df['person'].str.strip())
 
-def get_okrs_data(client):
+def get_okrs_data(client, bqstorage_client=None):
     """Get all OKRs from the most recent snapshot using external table views"""
     # Use latest view instead of raw table - automatically gets most recent data
-    okrs_query = f'SELECT * FROM `{config["dataset"]}.okrs_latest_view`'
-    okrs_df = client.query(okrs_query).to_dataframe()
+    okrs_query = f'SELECT {", ".join(OKR_COLUMNS)} FROM `{config["dataset"]}.okrs_latest_view`'
+    # Reuse the local copy when the latest scrape has already been downloaded
+    snapshot_id = get_latest_snapshot_id(client, config["dataset"])
+    okrs_df = cached_query_to_dataframe(client, okrs_query, snapshot_id, bqstorage_client)
+    okrs_df = okrs_df.rename(columns=OKR_COLUMNS)
     return okrs_df
 
 def build_goal_hierarchy(okrs_df: pd.DataFrame, cre_members: Set[str]) -> Dict:
@@ -48,60 +64,53 @@ def build_goal_hierarchy(okrs_df: pd.DataFrame, cre_members: Set[str]) -> Dict:
     # Create maps for efficient navigation
     goal_id_to_data = {}
     goal_id_to_children = {}
-    goal_id_to_parent = {}
-    root_goals = set()
-    
-    for _, row in okrs_df.iterrows():
-        goal_id = row.get('Goal Key', '') or ''
-        goal_name = row.get('Name', '') or ''
-        owner = (row.get('Owner', '') or '').strip()
-        parent_goal_id = (row.get('Parent Goal', '') or '').strip()
-        
-        if not goal_id:
-            continue
-            
+    
+    # Pull the columns out once instead of materializing a Series per row
+    goal_ids = okrs_df['Goal Key'].fillna('').to_numpy()
+    goal_names = okrs_df['Name'].fillna('').to_numpy()
+    owners = okrs_df['Owner'].fillna('').str.strip().to_numpy()
+    parent_goal_ids = okrs_df['Parent Goal'].fillna('').str.strip().to_numpy()
+    
+    has_id = goal_ids != ''
+    goal_ids = goal_ids[has_id]
+    parent_goal_ids = parent_goal_ids[has_id]
+    
+    for goal_id, goal_name, owner, parent_goal_id in zip(goal_ids, goal_names[has_id], owners[has_id], parent_goal_ids):
         # Store goal data
         goal_id_to_data[goal_id] = {
             'name': goal_name,
             'owner': owner,
             'parent_id': parent_goal_id if parent_goal_id else None
         }
-        
-        # Map parent-child relationships
-        goal_id_to_parent[goal_id] = parent_goal_id if parent_goal_id else None
-        
+    
+    # Map parent-child relationships
+    goal_id_to_parent = {goal_id: parent_goal_id if parent_goal_id else None
+                         for goal_id, parent_goal_id in zip(goal_ids, parent_goal_ids)}
+    
+    for goal_id, parent_goal_id in zip(goal_ids, parent_goal_ids):
         if parent_goal_id:
-            if parent_goal_id not in goal_id_to_children:
-                goal_id_to_children[parent_goal_id] = []
-            goal_id_to_children[parent_goal_id].append(goal_id)
-        else:
-            root_goals.add(goal_id)
-    
-    def is_cre_related(goal_id: str, visited: Set[str] = None) -> bool:
-        """Check if a goal is related to CREs (recursively)"""
-        if visited is None:
-            visited = set()
-            
-        if goal_id in visited:
-            return False
-            
-        visited.add(goal_id)
-        
-        # Check if direct owner is CRE
-        goal_data = goal_id_to_data.get(goal_id, {})
-        if goal_data.get('owner', '') in cre_members:
-            return True
-            
-        # Check children recursively
-        children = goal_id_to_children.get(goal_id, [])
+            goal_id_to_children.setdefault(parent_goal_id, []).append(goal_id)
+    
+    root_goals = set(goal_ids[parent_goal_ids == ''])
+    
+    # A goal is CRE-related when it, or anything below it, has a CRE owner.
+    # Walk up once from each CRE-owned goal instead of searching down from every goal.
+    goal_id_to_parents = {}
+    for parent_goal_id, children in goal_id_to_children.items():
         for child_id in children:
-            if is_cre_related(child_id, visited.copy()):
-                return True
-                
-        return False
+            goal_id_to_parents.setdefault(child_id, []).append(parent_goal_id)
+    
+    cre_related_goals = set()
+    pending = [goal_id for goal_id, goal_data in goal_id_to_data.items() if goal_data['owner'] in cre_members]
+    while pending:
+        goal_id = pending.pop()
+        if goal_id in cre_related_goals:
+            continue
+        cre_related_goals.add(goal_id)
+        pending.extend(goal_id_to_parents.get(goal_id, []))
     
     # Filter only CRE-related goals
-    cre_related_goals = {goal_id for goal_id in goal_id_to_data.keys() if is_cre_related(goal_id)}
+    cre_related_goals &= goal_id_to_data.keys()
     
     # Build hierarchical tree
     def build_tree_node(goal_id: str, level: int = 0) -> Dict:
@@ -163,14 +172,21 @@ def main():
     print("Generating goals tree for CRE teams (using external tables)...\n")
     
     client = bigquery.Client(project=config["project"]) if config["project"] else bigquery.Client()
+    # One Storage API read client shared by every download (Arrow streams instead of REST pages)
+    bqstorage_client = bigquery_storage.BigQueryReadClient()
     
-    # Get CRE members
-    cre_members = get_cre_team_members(client)
-    print(f"CRE team members found: {len(cre_members)}")
-    
-    # Get OKRs data
-    okrs_df = get_okrs_data(client)
-    print(f"Total OKRs in latest snapshot: {len(okrs_df)}")
+    # The two queries are independent, so run them side by side
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        cre_members_future = executor.submit(get_cre_team_members, client, bqstorage_client)
+        okrs_future = executor.submit(get_okrs_data, client, bqstorage_client)
+        
+        # Get CRE members
+        cre_members = cre_members_future.result()
+        print(f"CRE team members found: {len(cre_members)}")
+        
+        # Get OKRs data
+        okrs_df = okrs_future.result()
+        print(f"Total OKRs in latest snapshot: {len(okrs_df)}")
     
     # Build hierarchy
     trees = build_goal_hierarchy(okrs_df, cre_members)
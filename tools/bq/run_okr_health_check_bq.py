@@ -105,8 +105,9 @@ def execute_query(client, query, project_id):
     """Execute a BigQuery query and return results"""
     query_with_project = substitute_project_id(query, project_id)
     
-    job = client.query(query_with_project)
-    results = job.result()
+    # query_and_wait uses the jobs.query endpoint, which returns small
+    # result sets in a single round trip and only polls when it has to
+    results = client.query_and_wait(query_with_project)
     
     # Convert to list of dictionaries
     rows = []
@@ -152,6 +153,9 @@ def run_summary_queries(client, project_id, output_format):
     print("=" * 60)
     print()
     
+    # Unknown until the summary query reports it
+    people_without_okrs = None
+    
     # Query 1: Enhanced OKR Sanity Check Summary
     print("📊 1. OVERALL HEALTH SUMMARY")
     print("-" * 40)
@@ -160,6 +164,8 @@ def run_summary_queries(client, project_id, output_format):
         if summary_query:
             rows, schema = execute_query(client, summary_query, project_id)
             print(format_output(rows, schema, output_format))
+            if any(field.name == 'people_without_okrs' for field in schema):
+                people_without_okrs = sum(row.get('people_without_okrs') or 0 for row in rows)
         print()
     except Exception as e:
         print(f"❌ Error running summary query: {e}")
@@ -183,7 +189,10 @@ def run_summary_queries(client, project_id, output_format):
     print("-" * 40)
     try:
         missing_query = queries.get("6. PEOPLE WITHOUT OKRs BY TEAM")
-        if missing_query:
+        if people_without_okrs == 0:
+            # Summary already shows full coverage, no need to scan again
+            print("🎉 All team members have OKRs!")
+        elif missing_query:
             rows, schema = execute_query(client, missing_query, project_id)
             if rows:
                 print(format_output(rows, schema, output_format))
@@ -19,33 +19,40 @@ Arguments:
 Dependencies are managed in pyproject.toml. Install with: uv sync
 """
 
+import numpy as np
 import pandas as pd
 import os
 import sys
 import argparse
 from pathlib import Path
-from io import StringIO
-import tempfile
 
-# Add helpers to path
-sys.path.append(str(Path(__file__).parent.parent / 'helpers'))
-from config_loader import load_config
+# When run as a script (python tools/generate_okr_fix_messages.py) put the project
+# root on the path, so the helpers package imports the same way as with -m
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from helpers.config_loader import load_config
+from helpers.okr_sanity import SANITY_FIELDS, NULL_TOKENS, find_missing_fields, find_latest_csv, download_latest_from_cloud
 
-try:
-    from google.cloud import storage
-    CLOUD_STORAGE_AVAILABLE = True
-except ImportError:
-    CLOUD_STORAGE_AVAILABLE = False
+# Columns the checks run string operations on; typed as strings at parse time
+# so that no per-row conversion is needed (and all-empty columns stay strings)
+STRING_COLUMNS = ['Owner', 'Name', 'Target Date', 'Teams', 'Parent Goal', 'Progress Type', 'Lineage']
 
-def find_latest_csv():
-    """Find the most recent processed CSV file"""
-    import glob
-    csv_files = glob.glob("scraped/export-*_processed*.csv")
-    if not csv_files:
-        raise FileNotFoundError("No CSV files found matching pattern: scraped/export-*_processed*.csv")
-    
-    latest_file = max(csv_files, key=os.path.getmtime)
-    return latest_file
+# Short symbols used for missing fields in Slack messages
+FIELD_SYMBOLS = {
+    'Target Date': '📅',
+    'Teams': '👥', 
+    'Parent Goal': '🔗',
+    'Owner': '👤',
+    'Progress Type (Metric)': '📈',
+    'Lineage': '🌳'
+}
+
+# Symbol string for every combination of missing fields, indexed by the
+# bitmask from missing_fields_bitmask (bit i set = SANITY_FIELDS[i] missing)
+SYMBOL_TABLE = [
+    ' '.join(FIELD_SYMBOLS[field] for i, (_, field) in enumerate(SANITY_FIELDS) if bitmask & (1 << i))
+    for bitmask in range(1 << len(SANITY_FIELDS))
+]
 
 def load_team_members():
     """Load team members from teams.csv"""
@@ -53,72 +60,36 @@ def load_team_members():
         raise FileNotFoundError("Teams file not found: data/teams.csv")
     
     teams_df = pd.read_csv("data/teams.csv")
-    team_members = set(teams_df['name'].str.strip())
+    # Deduplicated before stripping, then interned so the isin() hashing
+    # against Owner values can short-circuit on identity
+    names = teams_df['name'].dropna().drop_duplicates().str.strip()
+    team_members = frozenset(sys.intern(name) for name in names)
     return teams_df, team_members
 
-def download_latest_from_cloud():
-    """Download the latest OKRs CSV file from Cloud Storage"""
-    if not CLOUD_STORAGE_AVAILABLE:
-        raise ImportError("google-cloud-storage not available. Install with: pip install google-cloud-storage")
-    
-    # Get bucket name - either from env var or compose from project ID
-    bucket_name = os.getenv('GCS_BUCKET_NAME')
-    if not bucket_name:
-        project_id = os.getenv('GOOGLE_CLOUD_PROJECT')
-        if not project_id:
-            # Try to get from gcloud config
-            try:
-                import subprocess
-                result = subprocess.run(['gcloud', 'config', 'get-value', 'project'], 
-                                      capture_output=True, text=True, check=True)
-                project_id = result.stdout.strip()
-            except (subprocess.CalledProcessError, FileNotFoundError):
-                raise ValueError("Cannot determine project ID. Set GOOGLE_CLOUD_PROJECT or GCS_BUCKET_NAME environment variable")
-        
-        bucket_name = f"{project_id}-okrs-data"
-    
-    print(f"☁️ Connecting to Cloud Storage bucket: {bucket_name}")
-    
+def read_okrs_csv(csv_file):
+    """Read the OKRs CSV with the pyarrow engine, falling back to the default parser"""
     try:
-        client = storage.Client()
-        bucket = client.bucket(bucket_name)
-        
-        # List all CSV files in the okrs/ prefix
-        blobs = list(bucket.list_blobs(prefix="okrs/export-"))
-        
-        # Filter for processed CSV files
-        csv_blobs = [blob for blob in blobs if blob.name.endswith('_processed.csv')]
-        
-        if not csv_blobs:
-            raise FileNotFoundError("No processed CSV files found in Cloud Storage bucket")
-        
-        # Sort by creation time and get the most recent
-        latest_blob = max(csv_blobs, key=lambda b: b.time_created)
-        
-        print(f"📁 Latest file found: {latest_blob.name}")
-        print(f"📅 Created: {latest_blob.time_created}")
-        
-        # Download content as string
-        csv_content = latest_blob.download_as_text()
-        
-        # Create a temporary file
-        temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False)
-        temp_file.write(csv_content)
-        temp_file.close()
-        
-        print(f"⬇️ Downloaded to temporary file: {temp_file.name}")
-        return temp_file.name, latest_blob.name
-        
-    except Exception as e:
-        raise Exception(f"Error downloading from Cloud Storage: {e}")
+        return pd.read_csv(
+            csv_file, engine='pyarrow', dtype_backend='pyarrow',
+            dtype={column: 'string[pyarrow]' for column in STRING_COLUMNS}
+        )
+    except (ImportError, ValueError):
+        # pyarrow missing or unable to parse this file
+        if hasattr(csv_file, 'seek'):
+            csv_file.seek(0)
+        return pd.read_csv(csv_file, dtype={column: 'string' for column in STRING_COLUMNS})
 
 def is_empty_or_null(value):
     """Check if a value is empty, null, nan, or None"""
-    if value is None:
+    # Common cases first, without allocating via str()
+    if isinstance(value, str):
+        return value.strip().lower() in NULL_TOKENS
+    if isinstance(value, float):
+        return value != value  # NaN
+    if value is None or value is pd.NA or value is pd.NaT:
         return True
     
-    str_value = str(value).strip().lower()
-    return str_value in ['', 'null', 'nan', 'none', 'na']
+    return str(value).strip().lower() in NULL_TOKENS
 
 def enhanced_okr_sanity_check(row):
     """Enhanced sanity check for OKRs - returns list of missing fields"""
@@ -144,16 +115,16 @@ def enhanced_okr_sanity_check(row):
 
 def format_missing_fields_short(missing_fields):
     """Format missing fields into short symbols"""
-    field_symbols = {
-        'Target Date': '📅',
-        'Teams': '👥', 
-        'Parent Goal': '🔗',
-        'Owner': '👤',
-        'Progress Type (Metric)': '📈',
-        'Lineage': '🌳'
-    }
-    
-    return ' '.join([field_symbols.get(field, '❓') for field in missing_fields])
+    return ' '.join([FIELD_SYMBOLS.get(field, '❓') for field in missing_fields])
+
+def missing_fields_bitmask(missing_matrix):
+    """Pack each row of a find_missing_fields matrix into an int (bit i = SANITY_FIELDS[i] missing)"""
+    weights = np.left_shift(1, np.arange(missing_matrix.shape[1]))
+    return missing_matrix.astype(np.int64) @ weights
+
+def format_missing_symbols(missing_matrix):
+    """Vectorized format_missing_fields_short over a find_missing_fields matrix"""
+    return np.array(SYMBOL_TABLE, dtype=object)[missing_fields_bitmask(missing_matrix)]
 
 def generate_slack_message(person_name, malformed_okrs_data):
     """Generate a personalized Slack message for a person with malformed OKRs"""
@@ -161,20 +132,13 @@ def generate_slack_message(person_name, malformed_okrs_data):
     # Extract first name only (first word)
     first_name = person_name.split()[0]
     
-    # Build table rows
-    table_rows = []
-    for _, okr in malformed_okrs_data.iterrows():
-        okr_name = okr.get('Name', 'Unknown OKR')
-        missing_fields = enhanced_okr_sanity_check(okr)
-        missing_symbols = format_missing_fields_short(missing_fields)
-        
-        # Truncate long OKR names
-        if len(okr_name) > 40:
-            okr_name = okr_name[:37] + "..."
-        
-        table_rows.append(f"| {okr_name:<43} | {missing_symbols:<8} |")
-    
-    table_content = '\n'.join(table_rows)
+    # Build table rows from the columns directly (no per-row Series)
+    # (long OKR names are truncated to 40 characters)
+    okr_names = malformed_okrs_data['Name'].to_numpy()
+    table_content = '\n'.join(
+        f"| {(okr_name[:37] + '...' if len(okr_name) > 40 else okr_name).ljust(43)} | {missing_symbols.ljust(8)} |"
+        for okr_name, missing_symbols in zip(okr_names, malformed_okrs_data['missing_symbols'])
+    )
     
     message = f"""Hi {first_name}! 👋
 
@@ -192,6 +156,10 @@ Please update when you can. Thanks! 🙏"""
     
     return message
 
+def format_message_block(index, person_name, message):
+    """Format one numbered message as it appears on stdout and in the output file"""
+    return f"MESSAGE {index}: {person_name}\n{'-' * 40}\n{message}\n\n{'-' * 60}\n\n"
+
 def main():
     # Parse command line arguments
     parser = argparse.ArgumentParser(description='Generate personalized Slack messages for OKR fixes')
@@ -203,7 +171,7 @@ def main():
     if args.file and args.cloud:
         print("❌ Error: Cannot use both --file and --cloud options simultaneously")
         return
-    
+
     print("📝 Generating OKR Fix Messages")
     print("=" * 50)
     print()
@@ -220,19 +188,17 @@ def main():
     print("📋 Loading team members...")
     try:
         teams_df, team_members = load_team_members()
-        print(f"✅ Loaded {len(team_members)} team members from {len(teams_df['team'].unique())} teams")
+        print(f"✅ Loaded {len(team_members)} team members from {teams_df['team'].nunique()} teams")
     except Exception as e:
         print(f"❌ Error loading team members: {e}")
         return
     
     # Find and load CSV
     print("📊 Loading OKRs CSV...")
-    temp_file_to_cleanup = None
     try:
         if args.cloud:
             # Download from Cloud Storage
             csv_file, cloud_filename = download_latest_from_cloud()
-            temp_file_to_cleanup = csv_file
             print(f"✅ Using latest file from cloud: {cloud_filename}")
         elif args.file:
             # Use specified file
@@ -246,17 +212,18 @@ def main():
             csv_file = find_latest_csv()
             print(f"✅ Using latest local file: {csv_file}")
         
-        okrs_df = pd.read_csv(csv_file)
+        okrs_df = read_okrs_csv(csv_file)
         print(f"📊 Total OKRs in CSV: {len(okrs_df)}")
     except Exception as e:
         print(f"❌ Error loading OKRs data: {e}")
-        # Cleanup temp file if it exists
-        if temp_file_to_cleanup and os.path.exists(temp_file_to_cleanup):
-            os.unlink(temp_file_to_cleanup)
         return
     
+    # Strip owners once and encode them as categories, so filtering and
+    # grouping below work on integer codes instead of strings
+    okrs_df['Owner'] = okrs_df['Owner'].str.strip().astype('category')
+    
     # Filter only team members' OKRs
-    team_okrs = okrs_df[okrs_df['Owner'].str.strip().isin(team_members)].copy()
+    team_okrs = okrs_df[okrs_df['Owner'].isin(team_members)].copy()
     print(f"🎯 OKRs from team members: {len(team_okrs)}")
     print()
     
@@ -266,38 +233,41 @@ def main():
     
     # Perform sanity check
     print("🔍 Analyzing malformed OKRs...")
-    team_okrs['sanity_missing'] = team_okrs.apply(enhanced_okr_sanity_check, axis=1)
-    team_okrs['is_sane'] = team_okrs['sanity_missing'].apply(lambda x: len(x) == 0)
+    missing_matrix = find_missing_fields(team_okrs)
+    malformed_mask = missing_matrix.any(axis=1)
     
-    # Get malformed OKRs
-    malformed_okrs = team_okrs[~team_okrs['is_sane']]
+    # Get malformed OKRs, with their missing-field symbols computed once up front
+    malformed_okrs = team_okrs.loc[malformed_mask].copy()
+    malformed_okrs['missing_symbols'] = format_missing_symbols(missing_matrix[malformed_mask])
     
     if malformed_okrs.empty:
         print("🎉 All OKRs are healthy! No messages needed.")
         return
     
-    print(f"📝 Found {len(malformed_okrs)} malformed OKRs from {malformed_okrs['Owner'].nunique()} people")
+    # Grouped once; the group count doubles as the number of people
+    okrs_by_owner = malformed_okrs.groupby('Owner', sort=False, observed=True)
+    print(f"📝 Found {len(malformed_okrs)} malformed OKRs from {okrs_by_owner.ngroups} people")
     print()
     
     # Generate messages for each person
-    messages = {}
-    for person in malformed_okrs['Owner'].unique():
-        person_malformed_okrs = malformed_okrs[malformed_okrs['Owner'] == person]
-        message = generate_slack_message(person, person_malformed_okrs)
-        messages[person] = message
+    messages = {
+        person: generate_slack_message(person, person_malformed_okrs)
+        for person, person_malformed_okrs in okrs_by_owner
+    }
+    
+    # Formatted once, shared by stdout and the output file
+    message_blocks = ''.join(
+        format_message_block(i, person, message)
+        for i, (person, message) in enumerate(messages.items(), 1)
+    )
     
     # Output messages
     print("📤 Generated Slack Messages:")
     print("=" * 60)
     print()
     
-    for i, (person, message) in enumerate(messages.items(), 1):
-        print(f"MESSAGE {i}: {person}")
-        print("-" * 40)
-        print(message)
-        print()
-        print("-" * 60)
-        print()
+    # One buffered write instead of several print() calls per person
+    sys.stdout.write(message_blocks)
     
     # Summary
     print(f"✅ Generated {len(messages)} personalized messages")
@@ -305,22 +275,9 @@ def main():
     
     # Optional: Save to file
     output_file = "okr_fix_messages.txt"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write("OKR Fix Messages\n")
-        f.write("=" * 50 + "\n\n")
-        
-        for i, (person, message) in enumerate(messages.items(), 1):
-            f.write(f"MESSAGE {i}: {person}\n")
-            f.write("-" * 40 + "\n")
-            f.write(message + "\n\n")
-            f.write("-" * 60 + "\n\n")
+    Path(output_file).write_text("OKR Fix Messages\n" + "=" * 50 + "\n\n" + message_blocks, encoding='utf-8')
     
     print(f"💾 Messages also saved to: {output_file}")
-    
-    # Cleanup temporary file if it exists
-    if temp_file_to_cleanup and os.path.exists(temp_file_to_cleanup):
-        os.unlink(temp_file_to_cleanup)
-        print("🗑️ Temporary file cleaned up")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -21,110 +21,60 @@ Arguments:
 Dependencies are managed in pyproject.toml. Install with: uv sync
 """
 
+import numpy as np
 import pandas as pd
 from tabulate import tabulate
 import os
+import sys
 import argparse
-import tempfile
+from pathlib import Path
 
-try:
-    from google.cloud import storage
-    CLOUD_STORAGE_AVAILABLE = True
-except ImportError:
-    CLOUD_STORAGE_AVAILABLE = False
+# When run as a script (python tools/okrs_sanity_check_scrap_data.py) put the project
+# root on the path, so the helpers package imports the same way as with -m
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from helpers.okr_sanity import SANITY_FIELDS, NULL_TOKENS, find_missing_fields, find_latest_csv, download_latest_from_cloud
 
 # Config
 TEAMS_CSV = "data/teams.csv"
-LATEST_CSV_PATTERN = "scraped/export-*_processed*.csv"
 
-def find_latest_csv():
-    """Find the most recent processed CSV file"""
-    import glob
-    csv_files = glob.glob(LATEST_CSV_PATTERN)
-    if not csv_files:
-        raise FileNotFoundError(f"No CSV files found matching pattern: {LATEST_CSV_PATTERN}")
-    
-    # Sort by modification time and get the most recent
-    latest_file = max(csv_files, key=os.path.getmtime)
-    return latest_file
+# Low-cardinality columns parsed as categoricals, so filters and groupbys work on int codes
+OKRS_CATEGORY_DTYPES = {'Owner': 'category'}
+TEAMS_CATEGORY_DTYPES = {'team': 'category'}
 
 def load_team_members():
     """Load team members from teams.csv"""
     if not os.path.exists(TEAMS_CSV):
         raise FileNotFoundError(f"Teams file not found: {TEAMS_CSV}")
     
-    teams_df = pd.read_csv(TEAMS_CSV)
-    team_members = set(teams_df['name'].str.strip())
+    teams_df = pd.read_csv(TEAMS_CSV, dtype=TEAMS_CATEGORY_DTYPES)
+    # Deduplicated before stripping, then interned so the isin() hashing
+    # against Owner values can short-circuit on identity
+    names = teams_df['name'].dropna().drop_duplicates().str.strip()
+    team_members = frozenset(sys.intern(name) for name in names)
     return teams_df, team_members
 
-def download_latest_from_cloud():
-    """Download the latest OKRs CSV file from Cloud Storage"""
-    if not CLOUD_STORAGE_AVAILABLE:
-        raise ImportError("google-cloud-storage not available. Install with: pip install google-cloud-storage")
-    
-    # Get bucket name - either from env var or compose from project ID
-    bucket_name = os.getenv('GCS_BUCKET_NAME')
-    if not bucket_name:
-        project_id = os.getenv('GOOGLE_CLOUD_PROJECT')
-        if not project_id:
-            # Try to get from gcloud config
-            try:
-                import subprocess
-                result = subprocess.run(['gcloud', 'config', 'get-value', 'project'], 
-                                      capture_output=True, text=True, check=True)
-                project_id = result.stdout.strip()
-            except (subprocess.CalledProcessError, FileNotFoundError):
-                raise ValueError("Cannot determine project ID. Set GOOGLE_CLOUD_PROJECT or GCS_BUCKET_NAME environment variable")
-        
-        bucket_name = f"{project_id}-okrs-data"
-    
-    print(f"☁️ Connecting to Cloud Storage bucket: {bucket_name}")
-    
-    try:
-        client = storage.Client()
-        bucket = client.bucket(bucket_name)
-        
-        # List all CSV files in the okrs/ prefix
-        blobs = list(bucket.list_blobs(prefix="okrs/export-"))
-        
-        # Filter for processed CSV files
-        csv_blobs = [blob for blob in blobs if blob.name.endswith('_processed.csv')]
-        
-        if not csv_blobs:
-            raise FileNotFoundError("No processed CSV files found in Cloud Storage bucket")
-        
-        # Sort by creation time and get the most recent
-        latest_blob = max(csv_blobs, key=lambda b: b.time_created)
-        
-        print(f"📁 Latest file found: {latest_blob.name}")
-        print(f"📅 Created: {latest_blob.time_created}")
-        
-        # Download content as string
-        csv_content = latest_blob.download_as_text()
-        
-        # Create a temporary file
-        temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False)
-        temp_file.write(csv_content)
-        temp_file.close()
-        
-        print(f"⬇️ Downloaded to temporary file: {temp_file.name}")
-        return temp_file.name, latest_blob.name
-        
-    except Exception as e:
-        raise Exception(f"Error downloading from Cloud Storage: {e}")
+def strip_names(names):
+    """Strip whitespace from a column of names, doing the work once per distinct name"""
+    names_cat = names.astype('category')
+    stripped = names_cat.cat.categories.str.strip()
+    return pd.Series(stripped.take(names_cat.cat.codes.to_numpy(), allow_fill=True, fill_value=np.nan),
+                     index=names.index)
 
 def is_empty_or_null(value):
     """
     Check if a value is empty, null, nan, or None
     """
-    if value is None:
+    # Strings and floats (the usual CSV cell types) are checked without str()
+    if isinstance(value, str):
+        return value.strip().lower() in NULL_TOKENS
+    if isinstance(value, float):
+        return value != value  # NaN
+    if value is None or value is pd.NA or value is pd.NaT:
         return True
     
-    # Convert to string and strip whitespace
-    str_value = str(value).strip().lower()
-    
-    # Check for empty, null, nan, or none values
-    return str_value in ['', 'null', 'nan', 'none', 'na']
+    # Check for empty, null, nan, or none string values
+    return str(value).strip().lower() in NULL_TOKENS
 
 def enhanced_okr_sanity_check(row):
     """
@@ -158,6 +108,11 @@ def enhanced_okr_sanity_check(row):
     
     return missing
 
+def missing_fields_lists(missing_matrix):
+    """Turn a find_missing_fields matrix into per-row lists of missing field names"""
+    field_names = [field for _, field in SANITY_FIELDS]
+    return [[field for field, missing in zip(field_names, row) if missing] for row in missing_matrix.tolist()]
+
 def checkmark(val):
     """Return checkmark or X based on boolean value"""
     return '✅' if val else '❌'
@@ -246,45 +201,41 @@ def get_malformed_okrs_and_teams(file: str = None, cloud: bool = False):
     teams_df, team_members = load_team_members()
 
     # Find and load CSV
-    temp_file_to_cleanup = None
-    try:
-        if cloud:
-            csv_file, _ = download_latest_from_cloud()
-            temp_file_to_cleanup = csv_file
-        elif file:
-            csv_file = file
-            if not os.path.exists(csv_file):
-                raise FileNotFoundError(f"Specified file not found: {csv_file}")
-        else:
-            csv_file = find_latest_csv()
-        
-        if not csv_file:
-            raise FileNotFoundError("No CSV file found")
+    if cloud:
+        csv_file, csv_name = download_latest_from_cloud()
+    elif file:
+        csv_file = csv_name = file
+        if not os.path.exists(csv_file):
+            raise FileNotFoundError(f"Specified file not found: {csv_file}")
+    else:
+        csv_file = csv_name = find_latest_csv()
+    
+    if not csv_file:
+        raise FileNotFoundError("No CSV file found")
 
-        print(f"📊 Loading data from: {csv_file}")
-        df = pd.read_csv(csv_file)
+    print(f"📊 Loading data from: {csv_name}")
+    df = pd.read_csv(csv_file, dtype=OKRS_CATEGORY_DTYPES)
 
-        # Ensure EntityId column is present (for backward compatibility)
-        if 'EntityId' not in df.columns:
-            print("⚠️ Warning: EntityId column not found in CSV. This may affect comment posting functionality.")
-            df['EntityId'] = None
+    # Ensure EntityId column is present (for backward compatibility)
+    if 'EntityId' not in df.columns:
+        print("⚠️ Warning: EntityId column not found in CSV. This may affect comment posting functionality.")
+        df['EntityId'] = None
 
-        okrs_df = df.copy() # Renamed df to okrs_df to avoid conflict with the function's return value
-    finally:
-        if temp_file_to_cleanup and os.path.exists(temp_file_to_cleanup):
-            os.unlink(temp_file_to_cleanup)
+    okrs_df = df.copy() # Renamed df to okrs_df to avoid conflict with the function's return value
 
     # Filter only team members' OKRs
-    team_okrs = okrs_df[okrs_df['Owner'].str.strip().isin(team_members)].copy()
+    team_okrs = okrs_df[strip_names(okrs_df['Owner']).isin(team_members)]
     if team_okrs.empty:
         return pd.DataFrame(), teams_df
 
     # Perform enhanced sanity check
-    team_okrs['sanity_missing'] = team_okrs.apply(enhanced_okr_sanity_check, axis=1)
-    team_okrs['is_sane'] = team_okrs['sanity_missing'].apply(lambda x: len(x) == 0)
+    missing_matrix = find_missing_fields(team_okrs)
+    is_malformed = missing_matrix.any(axis=1)
 
-    # Get malformed OKRs
-    malformed_team_okrs = team_okrs[~team_okrs['is_sane']].copy()
+    # Get malformed OKRs; missing-field lists are only built for those rows
+    malformed_team_okrs = team_okrs[is_malformed].copy()
+    malformed_team_okrs['sanity_missing'] = missing_fields_lists(missing_matrix[is_malformed])
+    malformed_team_okrs['is_sane'] = False
     return malformed_team_okrs, teams_df
 
 def main():
@@ -307,7 +258,7 @@ def main():
     print("📋 Loading team members...")
     try:
         teams_df, team_members = load_team_members()
-        print(f"✅ Loaded {len(team_members)} team members from {len(teams_df['team'].unique())} teams")
+        print(f"✅ Loaded {len(team_members)} team members from {teams_df['team'].nunique()} teams")
     except Exception as e:
         print(f"❌ Error loading team members: {e}")
         return
@@ -315,12 +266,10 @@ def main():
     
     # Find and load CSV
     print("📊 Loading OKRs CSV...")
-    temp_file_to_cleanup = None
     try:
         if args.cloud:
             # Download from Cloud Storage
             csv_file, cloud_filename = download_latest_from_cloud()
-            temp_file_to_cleanup = csv_file
             print(f"✅ Using latest file from cloud: {cloud_filename}")
         elif args.file:
             # Use specified file
@@ -334,17 +283,17 @@ def main():
             csv_file = find_latest_csv()
             print(f"✅ Using latest local file: {csv_file}")
         
-        okrs_df = pd.read_csv(csv_file)
+        okrs_df = pd.read_csv(csv_file, dtype=OKRS_CATEGORY_DTYPES)
         print(f"📊 Total OKRs in CSV: {len(okrs_df)}")
     except Exception as e:
         print(f"❌ Error loading OKRs data: {e}")
-        # Cleanup temp file if it exists
-        if temp_file_to_cleanup and os.path.exists(temp_file_to_cleanup):
-            os.unlink(temp_file_to_cleanup)
         return
     
-    # Filter only team members' OKRs
-    team_okrs = okrs_df[okrs_df['Owner'].str.strip().isin(team_members)].copy()
+    # Filter only team members' OKRs; stripped owner names are reused below
+    owner_names = strip_names(okrs_df['Owner'])
+    is_team_okr = owner_names.isin(team_members)
+    team_okrs = okrs_df[is_team_okr].copy()
+    team_owner_names = owner_names[is_team_okr]
     print(f"🎯 OKRs from team members: {len(team_okrs)}")
     print()
     
@@ -354,8 +303,8 @@ def main():
     
     # Perform enhanced sanity check
     print("🔍 Performing enhanced sanity check...")
-    team_okrs['sanity_missing'] = team_okrs.apply(enhanced_okr_sanity_check, axis=1)
-    team_okrs['is_sane'] = team_okrs['sanity_missing'].apply(lambda x: len(x) == 0)
+    missing_matrix = find_missing_fields(team_okrs)
+    team_okrs['is_sane'] = ~missing_matrix.any(axis=1)
     
     # Calculate statistics
     total_okrs = len(team_okrs)
@@ -372,44 +321,44 @@ def main():
     print("📋 OKRs Health by Team:")
     print("-" * 40)
     
+    # Count per owner once, then roll the counts up to teams through the roster
+    owner_counts = team_okrs.groupby(team_owner_names)['is_sane'].agg(['size', 'sum'])
+    roster = teams_df[['team', 'name']].drop_duplicates()
+    team_counts = roster.join(owner_counts, on='name', how='inner').groupby('team', sort=False, observed=True)[['size', 'sum']].sum()
+    team_order = pd.Index(teams_df['team'].dropna().unique())
+    team_counts = team_counts.loc[team_order.intersection(team_counts.index, sort=False)]
+
     team_stats = []
-    for team in teams_df['team'].unique():
-        team_members_list = teams_df[teams_df['team'] == team]['name'].tolist()
-        team_okrs_filtered = team_okrs[team_okrs['Owner'].str.strip().isin(team_members_list)]
-        
-        if not team_okrs_filtered.empty:
-            team_total = len(team_okrs_filtered)
-            team_sane = len(team_okrs_filtered[team_okrs_filtered['is_sane']])
-            team_malformed = team_total - team_sane
-            health_percentage = (team_sane / team_total * 100) if team_total > 0 else 0
-            
-            team_stats.append({
-                'Team': team,
-                'Total OKRs': team_total,
-                'Healthy': team_sane,
-                'Malformed': team_malformed,
-                'Health %': f"{health_percentage:.1f}%"
-            })
+    for team, team_total, team_sane in zip(team_counts.index, team_counts['size'], team_counts['sum']):
+        team_total, team_sane = int(team_total), int(team_sane)
+        team_malformed = team_total - team_sane
+        health_percentage = (team_sane / team_total * 100) if team_total > 0 else 0
+
+        team_stats.append({
+            'Team': team,
+            'Total OKRs': team_total,
+            'Healthy': team_sane,
+            'Malformed': team_malformed,
+            'Health %': f"{health_percentage:.1f}%"
+        })
     
     if team_stats:
-        team_stats_df = pd.DataFrame(team_stats)
-        
         # Calculate totals row
-        total_okrs = team_stats_df['Total OKRs'].sum()
-        total_healthy = team_stats_df['Healthy'].sum()
-        total_malformed = team_stats_df['Malformed'].sum()
+        total_okrs = sum(row['Total OKRs'] for row in team_stats)
+        total_healthy = sum(row['Healthy'] for row in team_stats)
+        total_malformed = sum(row['Malformed'] for row in team_stats)
         total_health_percentage = (total_healthy / total_okrs * 100) if total_okrs > 0 else 0
         
-        # Add totals row
-        total_row = pd.DataFrame([{
+        # Add totals row to the records, so the table is built once without a concat
+        team_stats.append({
             'Team': 'TOTAL',
             'Total OKRs': total_okrs,
             'Healthy': total_healthy,
             'Malformed': total_malformed,
             'Health %': f"{total_health_percentage:.1f}%"
-        }])
+        })
         
-        team_stats_df = pd.concat([team_stats_df, total_row], ignore_index=True)
+        team_stats_df = pd.DataFrame(team_stats)
         
         print(tabulate(team_stats_df, headers="keys", tablefmt="fancy_grid", showindex=False))
         print()
@@ -465,26 +414,13 @@ def main():
         print(f"❌ Malformed OKRs Details ({len(malformed_team_okrs)} total):")
         print("-" * 60)
         
-        malformed_table = []
-        for _, row in malformed_team_okrs.iterrows():
-            # Check each requirement
-            has_target_date = 'Target Date' not in row['sanity_missing']
-            has_teams = 'Teams' not in row['sanity_missing'] 
-            has_parent = 'Parent Goal' not in row['sanity_missing']
-            has_owner = 'Owner' not in row['sanity_missing']
-            has_metric = 'Progress Type (Metric)' not in row['sanity_missing']
-            has_lineage = 'Lineage' not in row['sanity_missing']
-            
-            malformed_table.append([
-                row.get('Owner', ''),
-                (row.get('Name', '')[:40] + "...") if len(str(row.get('Name', ''))) > 40 else row.get('Name', ''),
-                checkmark(has_target_date),
-                checkmark(has_teams),
-                checkmark(has_parent),
-                checkmark(has_owner),
-                checkmark(has_metric),
-                checkmark(has_lineage)
-            ])
+        # One ✅/❌ column per SANITY_FIELDS entry, straight from the missing-field matrix
+        checks = np.where(missing_matrix[~team_okrs['is_sane'].to_numpy()], checkmark(False), checkmark(True))
+        names = [(name[:40] + "...") if len(str(name)) > 40 else name for name in malformed_team_okrs['Name']]
+        malformed_table = [
+            [owner, name, *row_checks]
+            for owner, name, row_checks in zip(malformed_team_okrs['Owner'], names, checks.tolist())
+        ]
         
         headers = [
             "Owner", 
@@ -554,18 +490,24 @@ def main():
     print("👥 People without OKRs by Team:")
     print("-" * 40)
     
-    people_with_okrs = set(team_okrs['Owner'].str.strip())
+    people_with_okrs = set(team_owner_names)
     missing_okrs_by_team = []
-    
+
+    # One pass over the roster instead of re-filtering it for every team
+    member_names = teams_df['name'].str.strip()
+    members_without_okrs = teams_df.assign(name=member_names)[~member_names.isin(people_with_okrs)]
+
+    missing_by_team = members_without_okrs.groupby('team', observed=True)['name']
+
+    # Report teams in roster order, as they appear in the teams file
     for team in teams_df['team'].unique():
-        team_members_list = set(teams_df[teams_df['team'] == team]['name'].str.strip())
-        people_without_okrs = team_members_list - people_with_okrs
-        
-        if people_without_okrs:
-            missing_okrs_by_team.append([f"📋 {team}", ""])
-            for person in sorted(people_without_okrs):
-                missing_okrs_by_team.append([f"   • {person}", ""])
-            missing_okrs_by_team.append(["", ""])  # Separator
+        if team not in missing_by_team.groups:
+            continue
+        people_without_okrs = missing_by_team.get_group(team)
+        missing_okrs_by_team.append([f"📋 {team}", ""])
+        for person in sorted(set(people_without_okrs)):
+            missing_okrs_by_team.append([f"   • {person}", ""])
+        missing_okrs_by_team.append(["", ""])  # Separator
     
     if missing_okrs_by_team:
         # Remove last separator
@@ -583,11 +525,6 @@ def main():
     
     print()
     print("✅ Enhanced sanity check completed!")
-    
-    # Cleanup temporary file if it exists
-    if temp_file_to_cleanup and os.path.exists(temp_file_to_cleanup):
-        os.unlink(temp_file_to_cleanup)
-        print("🗑️ Temporary file cleaned up")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -9,7 +9,8 @@ Supports three data sources:
 3. BigQuery external table (--bigquery)
 
 Usage:
-    python post_okr_comments.py [--file <csv_file>] [--cloud] [--bigquery]
+    python tools/post_okr_comments.py [--file <csv_file>] [--cloud] [--bigquery] [--yes | --dry-run]
+    python -m tools.post_okr_comments [--file <csv_file>] [--cloud] [--bigquery] [--yes | --dry-run]
 
 Dependencies are managed in pyproject.toml. Install with: uv sync
 """
@@ -18,32 +19,65 @@ import sys
 import os
 import argparse
 import json
-import requests
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-sys.path.append(str(Path(__file__).parent.parent / 'helpers'))
-from config_loader import load_config, get_bigquery_config
-
-sys.path.append(str(Path(__file__).parent))
-from okrs_sanity_check_scrap_data import get_malformed_okrs_and_teams, is_empty_or_null
+# When run as a script (python tools/post_okr_comments.py) put the project root on
+# the path once, so the helpers and tools packages import the same way as with -m
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from helpers.config_loader import load_config, get_bigquery_config
 
 try:
-    from google.cloud import bigquery
-    BIGQUERY_AVAILABLE = True
+    import orjson
+
+    def encode_json(obj):
+        """Serialize obj to UTF-8 JSON bytes (orjson)"""
+        return orjson.dumps(obj)
 except ImportError:
-    BIGQUERY_AVAILABLE = False
+    def encode_json(obj):
+        """Serialize obj to UTF-8 JSON bytes (standard library fallback)"""
+        return json.dumps(obj).encode('utf-8')
+
+# pandas, BigQuery and requests are imported where they are first needed, so
+# argument errors and --help return without paying for those imports
+
+# BigQuery columns returned by the malformed OKRs query, mapped to the CSV-style names
+MALFORMED_OKR_COLUMNS = {
+    'goal_key': 'Goal Key',
+    'goal_name': 'Name',
+    'owner': 'Owner',
+    'target_date': 'Target Date',
+    'parent_goal': 'Parent Goal',
+    'lineage': 'Lineage',
+    'entity_id': 'EntityId',
+}
+
+# Row keys that may hold the entityId, in order of preference
+ENTITY_ID_KEYS = ('EntityId', 'entity_id', 'entityId')
+
+# Comments sent per request when posting confirmed OKRs as a GraphQL batch
+COMMENT_BATCH_SIZE = 10
+
+# Batches posted concurrently; also the size of the session's connection pool
+COMMENT_POST_WORKERS = 4
+
+# GraphQL mutation sent with every comment
+CREATE_COMMENT_MUTATION = ("mutation CreateCommentMutation(\n  $input: createCommentInput!\n) {\n  createComment(input: $input) {\n    comment {\n      id\n      ...Comment\n    }\n  }\n}\n\nfragment Comment on Comment {\n  id\n  ari\n  commentText\n  creationDate\n  editDate\n  creator {\n    aaid\n    ...UserAvatar\n    id\n  }\n}\n\nfragment UserAvatar on User {\n  aaid\n  pii {\n    picture\n    name\n    accountStatus\n    accountId\n  }\n}\n")
+
+# English phrase for each missing field in the comment text (fields not listed are used as-is)
+MISSING_FIELD_PHRASES = {
+    'Target Date': 'Target Date',
+    'Teams': 'Teams',
+    'Parent Goal': 'Parent Goal',
+    'Owner': 'Owner',
+    'Progress Type (Metric)': 'Progress Metric',
+    'Lineage': 'Lineage',
+}
 
 def format_missing_fields_english(missing_fields):
     """Format missing fields as English phrases"""
-    field_phrases = {
-        'Target Date': 'Target Date',
-        'Teams': 'Teams',
-        'Parent Goal': 'Parent Goal',
-        'Owner': 'Owner',
-        'Progress Type (Metric)': 'Progress Metric',
-        'Lineage': 'Lineage',
-    }
-    return ', '.join([field_phrases.get(field, field) for field in missing_fields])
+    return ', '.join(MISSING_FIELD_PHRASES.get(field, field) for field in missing_fields)
 
 def generate_okr_comment_message(okr_row):
     okr_name = okr_row.get('Name', 'Unknown OKR')
@@ -56,24 +90,32 @@ def generate_okr_comment_message(okr_row):
     )
     return message
 
+def is_valid_entity_id(value):
+    """Check that an entityId value is set (not None, NaN/NA, blank or the string 'null')"""
+    if value is None:
+        return False
+    if isinstance(value, str):
+        value = value.strip()
+        return value != '' and value.lower() != 'null'
+    # Anything else comes from a DataFrame row, so pandas is already loaded; pd.isna also
+    # covers pd.NA from nullable/pyarrow columns, whose truth value is ambiguous
+    import pandas as pd
+    if pd.api.types.is_scalar(value) and pd.isna(value):
+        return False
+    return bool(value)
+
 def get_entity_id_from_row(okr_row, config):
     """
     Get the entityId for the OKR. Prefer the 'EntityId' column if present and not null.
     Fallback to previous logic if not present.
     """
-    # Prefer the 'EntityId' column if available
-    entity_id = okr_row.get('EntityId')
-    if entity_id and str(entity_id).lower() != 'null' and str(entity_id).strip() != '':
-        return entity_id
-    
-    # Fallback to 'entity_id' (lowercase) if present (BigQuery compatibility)
-    entity_id = okr_row.get('entity_id')
-    if entity_id and str(entity_id).lower() != 'null' and str(entity_id).strip() != '':
-        return entity_id
+    # Prefer the 'EntityId' column, then 'entity_id' (BigQuery) and the legacy 'entityId'
+    for key in ENTITY_ID_KEYS:
+        entity_id = okr_row.get(key)
+        if is_valid_entity_id(entity_id):
+            return entity_id
     
     # Legacy fallbacks
-    if 'entityId' in okr_row:
-        return okr_row['entityId']
     if 'Goal Key' in okr_row and 'ATLASSIAN_ENTITY_ID_PREFIX' in config:
         return config['ATLASSIAN_ENTITY_ID_PREFIX'] + str(okr_row['Goal Key'])
     return config.get('ATLASSIAN_ENTITY_ID')
@@ -83,7 +125,10 @@ def get_malformed_okrs_from_bigquery():
     Get malformed OKRs directly from BigQuery external table.
     Uses the same logic as the Python script but queries BigQuery directly.
     """
-    if not BIGQUERY_AVAILABLE:
+    try:
+        from google.cloud import bigquery
+        from google.cloud import bigquery_storage
+    except ImportError:
         raise ImportError("Google Cloud BigQuery library not available. Install with: pip install google-cloud-bigquery")
     
     bq_config = get_bigquery_config()
@@ -98,107 +143,73 @@ def get_malformed_okrs_from_bigquery():
     
     client = bigquery.Client(project=project_id)
     
-    # Query to get malformed OKRs using the same logic as the Python script
+    # Query to get malformed OKRs using the same logic as the Python script.
+    # Only the columns used for the checks and the comments are selected.
     query = f"""
-    SELECT 
-      goal_key as goal_key,
-      goal_name as goal_name,
-      owner as owner,
-      target_date as target_date,
-      parent_goal as parent_goal,
-      sub_goals_array as sub_goals_array,
-      tags_array as tags_array,
-      progress_type as progress_type,
-      teams_array as teams_array,
-      start_date as start_date,
-      creation_date as creation_date,
-      lineage as lineage,
-      entity_id as entity_id,
-      -- Check each requirement (same logic as Python script)
-      CASE WHEN has_target_date THEN 0 ELSE 1 END +
-      CASE WHEN teams_array IS NOT NULL AND ARRAY_LENGTH(teams_array) > 0 THEN 0 ELSE 1 END +
-      CASE WHEN parent_goal IS NOT NULL THEN 0 ELSE 1 END +
-      CASE WHEN owner IS NOT NULL AND TRIM(owner) != '' THEN 0 ELSE 1 END +
-      CASE WHEN has_metric THEN 0 ELSE 1 END +
-      CASE WHEN has_lineage THEN 0 ELSE 1 END as missing_count,
-      -- Build missing fields list using CASE statements
-      CASE 
-        WHEN NOT has_target_date THEN 'Target Date'
-        WHEN NOT (teams_array IS NOT NULL AND ARRAY_LENGTH(teams_array) > 0) THEN 'Teams'
-        WHEN NOT (parent_goal IS NOT NULL) THEN 'Parent Goal'
-        WHEN NOT (owner IS NOT NULL AND TRIM(owner) != '') THEN 'Owner'
-        WHEN NOT has_metric THEN 'Progress Type (Metric)'
-        WHEN NOT has_lineage THEN 'Lineage'
-        ELSE ''
-      END as sanity_missing
-    FROM `{project_id}.{bq_config['dataset']}.okrs_emea_analysis_view`
-    WHERE 
-      -- Only malformed OKRs
-      CASE WHEN has_target_date THEN 0 ELSE 1 END +
-      CASE WHEN teams_array IS NOT NULL AND ARRAY_LENGTH(teams_array) > 0 THEN 0 ELSE 1 END +
-      CASE WHEN parent_goal IS NOT NULL THEN 0 ELSE 1 END +
-      CASE WHEN owner IS NOT NULL AND TRIM(owner) != '' THEN 0 ELSE 1 END +
-      CASE WHEN has_metric THEN 0 ELSE 1 END +
-      CASE WHEN has_lineage THEN 0 ELSE 1 END > 0
+    WITH checks AS (
+      SELECT
+        goal_key,
+        goal_name,
+        owner,
+        target_date,
+        parent_goal,
+        lineage,
+        entity_id,
+        -- Check each requirement once (same logic as Python script)
+        IFNULL(has_target_date, FALSE) AS has_target_date,
+        teams_array IS NOT NULL AND ARRAY_LENGTH(teams_array) > 0 AS has_teams,
+        parent_goal IS NOT NULL AS has_parent_goal,
+        owner IS NOT NULL AND TRIM(owner) != '' AS has_owner,
+        IFNULL(has_metric, FALSE) AS has_metric,
+        IFNULL(has_lineage, FALSE) AS has_lineage
+      FROM `{project_id}.{bq_config['dataset']}.okrs_emea_analysis_view`
+    ),
+    flagged AS (
+      SELECT 
+        goal_key,
+        goal_name,
+        owner,
+        target_date,
+        parent_goal,
+        lineage,
+        entity_id,
+        -- Build the full list of missing fields, not just the first one
+        ARRAY_CONCAT(
+          IF(NOT has_target_date, ['Target Date'], []),
+          IF(NOT has_teams, ['Teams'], []),
+          IF(NOT has_parent_goal, ['Parent Goal'], []),
+          IF(NOT has_owner, ['Owner'], []),
+          IF(NOT has_metric, ['Progress Type (Metric)'], []),
+          IF(NOT has_lineage, ['Lineage'], [])
+        ) as sanity_missing
+      FROM checks
+    )
+    SELECT
+      *,
+      -- Preview text for the confirmation prompt
+      ARRAY_TO_STRING(sanity_missing, ', ') AS missing_fields_text
+    FROM flagged
+    -- Only malformed OKRs, filtered on the list built above
+    WHERE ARRAY_LENGTH(sanity_missing) > 0
     ORDER BY owner, goal_name
     """
     
     try:
-        query_job = client.query(query)
-        results = query_job.result()
-        
-        # Convert to DataFrame-like structure
-        malformed_okrs = []
-        for row in results:
-            okr_dict = dict(row.items())
-            # Map column names to expected format
-            mapped_dict = {
-                'Goal Key': okr_dict.get('goal_key', ''),
-                'Name': okr_dict.get('goal_name', ''),
-                'Owner': okr_dict.get('owner', ''),
-                'Target Date': okr_dict.get('target_date', ''),
-                'Parent Goal': okr_dict.get('parent_goal', ''),
-                'Sub-goals': okr_dict.get('sub_goals_array', []),
-                'Tags': okr_dict.get('tags_array', []),
-                'Progress Type': okr_dict.get('progress_type', ''),
-                'Teams': okr_dict.get('teams_array', []),
-                'Start Date': okr_dict.get('start_date', ''),
-                'Creation Date': okr_dict.get('creation_date', ''),
-                'Lineage': okr_dict.get('lineage', ''),
-                'EntityId': okr_dict.get('entity_id', ''),
-                'sanity_missing': okr_dict.get('sanity_missing', [])
-            }
-            
-            # Convert arrays to strings for compatibility
-            if mapped_dict['Sub-goals']:
-                mapped_dict['Sub-goals'] = ';'.join(mapped_dict['Sub-goals'])
-            if mapped_dict['Tags']:
-                mapped_dict['Tags'] = ';'.join(mapped_dict['Tags'])
-            if mapped_dict['Teams']:
-                mapped_dict['Teams'] = ';'.join(mapped_dict['Teams'])
-            # Convert sanity_missing string to list
-            if mapped_dict['sanity_missing'] and mapped_dict['sanity_missing'] != '':
-                mapped_dict['sanity_missing'] = [mapped_dict['sanity_missing']]
-            else:
-                mapped_dict['sanity_missing'] = []
-            
-            malformed_okrs.append(mapped_dict)
+        # Download through the Storage Read API as Arrow batches instead of row by row.
+        # The rows are only iterated, so go straight from Arrow to dicts without pandas.
+        bqstorage_client = bigquery_storage.BigQueryReadClient()
+        table = client.query_and_wait(query).to_arrow(bqstorage_client=bqstorage_client)
+        table = table.rename_columns([MALFORMED_OKR_COLUMNS.get(name, name) for name in table.column_names])
+        malformed_okrs = table.to_pylist()
         
         return malformed_okrs, []  # Return empty teams list for compatibility
         
     except Exception as e:
         raise Exception(f"Error querying BigQuery: {e}")
 
-def post_comment_to_atlassian(entity_id, comment_text, config):
-    """
-    Post a comment to the Atlassian endpoint using the provided entity_id and comment_text.
-    All headers, cookies, and endpoint URL are loaded from config.
-    """
-    # Compose the URL from config values
-    base_url = config['ATLASSIAN_BASE_URL'].rstrip('/')
-    cloud_id = config['CLOUD_ID']
-    url = f"{base_url}/gateway/api/townsquare/s/{cloud_id}/graphql?operationName=CreateCommentMutation"
-    headers = {
+def build_atlassian_headers(config):
+    """Build the request headers (including cookies) for the Atlassian GraphQL endpoint"""
+    return {
         'accept': '*/*',
         'accept-language': 'en-US,en;q=0.9',
         'atl-client-name': config.get('ATL_CLIENT_NAME', 'townsquare-frontend'),
@@ -209,16 +220,47 @@ def post_comment_to_atlassian(entity_id, comment_text, config):
         'user-agent': config.get('ATL_USER_AGENT', 'Mozilla/5.0'),
         'cookie': config['ATLASSIAN_COOKIES'],
     }
-    # Compose the GraphQL payload
-    graphql_query = ("mutation CreateCommentMutation(\n  $input: createCommentInput!\n) {\n  createComment(input: $input) {\n    comment {\n      id\n      ...Comment\n    }\n  }\n}\n\nfragment Comment on Comment {\n  id\n  ari\n  commentText\n  creationDate\n  editDate\n  creator {\n    aaid\n    ...UserAvatar\n    id\n  }\n}\n\nfragment UserAvatar on User {\n  aaid\n  pii {\n    picture\n    name\n    accountStatus\n    accountId\n  }\n}\n")
+
+def create_atlassian_session(config):
+    """
+    Create a session that keeps the connection to Atlassian alive between comments.
+    The headers are built once and sent with every request of the session.
+    Only connection failures and rate limiting (429) are retried, so a comment that
+    may already have been created is never posted twice.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    retry = Retry(
+        total=3,
+        read=0,
+        backoff_factor=0.2,
+        status_forcelist=[429],
+        allowed_methods=frozenset(['POST']),
+        raise_on_status=False,
+    )
+    session = requests.Session()
+    session.headers.update(build_atlassian_headers(config))
+    session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=COMMENT_POST_WORKERS, max_retries=retry))
+    return session
+
+def get_atlassian_graphql_url(config):
+    """Compose the CreateCommentMutation endpoint URL from config values"""
+    base_url = config['ATLASSIAN_BASE_URL'].rstrip('/')
+    cloud_id = config['CLOUD_ID']
+    return f"{base_url}/gateway/api/townsquare/s/{cloud_id}/graphql?operationName=CreateCommentMutation"
+
+def build_comment_operation(entity_id, comment_text):
+    """Build the GraphQL CreateCommentMutation operation for one comment"""
     # Atlassian expects commentText as a JSON string (rich text format)
-    comment_text_json = json.dumps({
+    comment_text_json = encode_json({
         "version": 1,
         "type": "doc",
         "content": [
             {"type": "paragraph", "content": [{"type": "text", "text": comment_text}]}
         ]
-    })
+    }).decode('utf-8')
     variables = {
         "input": {
             "entityId": entity_id,
@@ -226,18 +268,105 @@ def post_comment_to_atlassian(entity_id, comment_text, config):
         },
         "connections": [f"client:{entity_id}:comments"]
     }
-    payload = {
-        "query": graphql_query,
+    return {
+        "operationName": "CreateCommentMutation",
+        "query": CREATE_COMMENT_MUTATION,
         "variables": variables
     }
-    response = requests.post(url, headers=headers, data=json.dumps(payload))
+
+def post_comment_to_atlassian(entity_id, comment_text, graphql_url, session):
+    """
+    Post a comment to the Atlassian endpoint using the provided entity_id and comment_text.
+    graphql_url comes from get_atlassian_graphql_url; headers and cookies come from the session.
+    """
+    payload = build_comment_operation(entity_id, comment_text)
+    response = session.post(graphql_url, data=encode_json(payload))
     return response
 
+def get_operation_outcome(result):
+    """
+    Turn one GraphQL operation result into (success, error_text), where success is
+    True (posted), False (not posted) or None (unknown: check the OKR before retrying).
+    """
+    if not isinstance(result, dict):
+        return None, f"Unexpected response: {json.dumps(result)}"
+    if result.get('errors'):
+        # Errors next to a non-null mutation payload may still have created the comment
+        if any(value is not None for value in (result.get('data') or {}).values()):
+            return None, json.dumps(result['errors'])
+        return False, json.dumps(result['errors'])
+    return True, ''
+
+def is_rejected_batch(response):
+    """
+    Check whether the endpoint refused a batch as a whole: a 200/400 whose body is
+    a single top-level 'errors' object with no 'data', so no operation was run.
+    """
+    if response.status_code not in (200, 400):
+        return False
+    try:
+        body = response.json()
+    except ValueError:
+        return False
+    return isinstance(body, dict) and bool(body.get('errors')) and body.get('data') is None
+
+def post_comments_batch_to_atlassian(comments, graphql_url, session):
+    """
+    Post several comments in one request as a GraphQL batch (a JSON array of operations).
+    Falls back to one request per comment only when the endpoint clearly rejected the
+    batch. A successful response in any other shape may still have created comments,
+    so those are reported as unknown rather than failed, to avoid duplicates on a rerun.
+
+    Args:
+        comments (list): (entity_id, comment_text) tuples
+        graphql_url (str): Endpoint from get_atlassian_graphql_url
+        session: Session from create_atlassian_session
+
+    Returns:
+        list: (success, error_text) per comment, in the same order; success is
+        True, False, or None when the outcome is unknown
+    """
+    payload = [build_comment_operation(entity_id, comment_text) for entity_id, comment_text in comments]
+    response = session.post(graphql_url, data=encode_json(payload))
+    
+    results = None
+    if response.status_code == 200:
+        try:
+            results = response.json()
+        except ValueError:
+            results = None
+    
+    if isinstance(results, list) and len(results) == len(comments):
+        return [get_operation_outcome(result) for result in results]
+    
+    if is_rejected_batch(response):
+        # The batch was refused before any operation ran: post one by one
+        outcomes = []
+        for entity_id, comment_text in comments:
+            single = post_comment_to_atlassian(entity_id, comment_text, graphql_url, session)
+            if single.status_code != 200:
+                outcomes.append((False, f"Status: {single.status_code}\nResponse: {single.text}"))
+                continue
+            try:
+                outcomes.append(get_operation_outcome(single.json()))
+            except ValueError:
+                outcomes.append((None, f"Status: {single.status_code}\nResponse: {single.text}"))
+        return outcomes
+    
+    if response.status_code == 200:
+        # Accepted, but not as one result per operation: some comments may exist
+        return [(None, f"Status: {response.status_code}\nResponse: {response.text}")] * len(comments)
+    
+    return [(False, f"Status: {response.status_code}\nResponse: {response.text}")] * len(comments)
+
 def main():
     parser = argparse.ArgumentParser(description='Post comments to Atlassian for malformed OKRs')
     parser.add_argument('--file', '-f', type=str, help='Specify the CSV file to analyze (local file)')
     parser.add_argument('--cloud', '-c', action='store_true', help='Download and analyze the latest file from Cloud Storage bucket')
     parser.add_argument('--bigquery', '-b', action='store_true', help='Get malformed OKRs directly from BigQuery external table')
+    confirm_mode = parser.add_mutually_exclusive_group()
+    confirm_mode.add_argument('--yes', '-y', action='store_true', help='Post every comment without asking for confirmation')
+    confirm_mode.add_argument('--dry-run', action='store_true', help='Show the comment previews without posting anything')
     args = parser.parse_args()
 
     # Validate arguments
@@ -255,17 +384,20 @@ def main():
         if args.bigquery:
             print("📊 Loading from BigQuery...")
             malformed_okrs, teams_df = get_malformed_okrs_from_bigquery()
-            # Convert to DataFrame-like structure for compatibility
-            import pandas as pd
-            malformed_okrs = pd.DataFrame(malformed_okrs)
         else:
             print("📁 Loading from CSV...")
-            malformed_okrs, teams_df = get_malformed_okrs_and_teams(file=args.file, cloud=args.cloud)
+            from tools.okrs_sanity_check_scrap_data import get_malformed_okrs_and_teams
+            malformed_df, teams_df = get_malformed_okrs_and_teams(file=args.file, cloud=args.cloud)
+            if not malformed_df.empty:
+                # Join every missing-field list for the preview in one column operation
+                malformed_df['missing_fields_text'] = malformed_df['sanity_missing'].str.join(', ')
+            # Plain dicts, same shape as the BigQuery rows; the helpers only use .get()
+            malformed_okrs = malformed_df.to_dict(orient='records')
     except Exception as e:
         print(f"❌ Error loading data: {e}")
         return
 
-    if malformed_okrs.empty:
+    if not malformed_okrs:
         print("🎉 No malformed OKRs found. Exiting.")
         return
 
@@ -278,45 +410,79 @@ def main():
         print(f"❌ Error loading config: {e}")
         return
 
-    for idx, row in malformed_okrs.iterrows():
+    # The goal URL only depends on the Goal Key, so build the rest once
+    base_url = config.get('ATLASSIAN_BASE_URL', '').rstrip('/')
+    cloud_id = config.get('CLOUD_ID', '')
+    goal_url_prefix = None
+    if base_url and cloud_id:
+        goal_url_prefix = f"{base_url}/o/{config.get('ORGANIZATION_ID','')}/s/{cloud_id}/goal/"
+
+    # Confirm every comment first, then post the confirmed ones together
+    to_post = []
+    for row in malformed_okrs:
         okr_name = row.get('Name', 'Unknown OKR')
         owner = row.get('Owner', 'Unknown Owner')
-        missing_fields = row.get('sanity_missing', [])
         message = generate_okr_comment_message(row)
         # Get OKR URL if present, else construct
         okr_url = row.get('url')
         if not okr_url or str(okr_url).lower() == 'null':
             # Try to construct from config and Goal Key
-            base_url = config.get('ATLASSIAN_BASE_URL', '').rstrip('/')
-            cloud_id = config.get('CLOUD_ID', '')
             goal_key = row.get('Goal Key', '')
-            if base_url and cloud_id and goal_key:
-                okr_url = f"{base_url}/o/{config.get('ORGANIZATION_ID','')}/s/{cloud_id}/goal/{goal_key}"
+            if goal_url_prefix and goal_key:
+                okr_url = f"{goal_url_prefix}{goal_key}"
             else:
                 okr_url = '(URL not available)'
         print("="*60)
         print(f"OKR: {okr_name}\nOwner: {owner}")
         print(f"Atlas URL: {okr_url}")
-        print(f"Missing fields: {', '.join(missing_fields)}")
+        print(f"Missing fields: {row['missing_fields_text']}")
         print("\nPreview of comment to be posted:")
         print("-"*60)
         print(message)
         print("-"*60)
-        confirm = input("Do you want to post this comment to Atlassian? [y/N]: ").strip().lower()
-        if confirm != 'y':
-            print("Skipping this OKR.\n")
+        if args.dry_run:
+            print("Dry run: not posting.\n")
             continue
+        if not args.yes:
+            confirm = input("Do you want to post this comment to Atlassian? [y/N]: ").strip().lower()
+            if confirm != 'y':
+                print("Skipping this OKR.\n")
+                continue
         # Get entityId for this OKR
         entity_id = get_entity_id_from_row(row, config)
         if not entity_id:
             print("❌ Could not determine entityId for this OKR. Skipping.\n")
             continue
-        print("Posting comment...")
-        response = post_comment_to_atlassian(entity_id, message, config)
-        if response.status_code == 200:
-            print("✅ Comment posted successfully!\n")
-        else:
-            print(f"❌ Failed to post comment. Status: {response.status_code}\nResponse: {response.text}\n")
+        print("Queued for posting.\n")
+        to_post.append((okr_name, entity_id, message))
+
+    if not to_post:
+        print("No comments to post.")
+        return
+
+    # One session for the whole run so every comment reuses the same connection and headers
+    session = create_atlassian_session(config)
+    graphql_url = get_atlassian_graphql_url(config)
+
+    # Post the confirmed comments in batches to save a round trip per OKR, with
+    # several batches in flight at once since each request mostly waits on the network
+    print(f"📤 Posting {len(to_post)} comments...")
+    batches = [to_post[start:start + COMMENT_BATCH_SIZE] for start in range(0, len(to_post), COMMENT_BATCH_SIZE)]
+    
+    def post_batch(batch):
+        return post_comments_batch_to_atlassian(
+            [(entity_id, message) for _, entity_id, message in batch], graphql_url, session)
+    
+    with ThreadPoolExecutor(max_workers=COMMENT_POST_WORKERS) as executor:
+        # map keeps the batch order, so results print in the order the OKRs were reviewed
+        for batch, outcomes in zip(batches, executor.map(post_batch, batches)):
+            for (okr_name, _, _), (success, error_text) in zip(batch, outcomes):
+                if success:
+                    print(f"✅ {okr_name}: comment posted successfully!")
+                elif success is None:
+                    print(f"⚠️ {okr_name}: unknown whether the comment was posted, check the OKR in Atlas before retrying. {error_text}")
+                else:
+                    print(f"❌ {okr_name}: failed to post comment. {error_text}")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file